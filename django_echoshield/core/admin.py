@@ -1,9 +1,119 @@
 """
 Django admin interface for EchoShield core models.
 """
+import csv
+import time
+from functools import lru_cache
+
 from django.contrib import admin
-from django.utils.html import format_html
-from .models import Event, Track, TrackContributor
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import CharField, Count, Value
+from django.db.models.functions import Cast, Concat, Substr
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from django.utils.safestring import mark_safe
+from .models import Event, EventCode, GccPhatMetadata, SensorNode, Track, TrackContributor
+
+# Latency status -> display color for the Event changelist
+LATENCY_STATUS_COLORS = {
+    Event.LATENCY_NORMAL: 'green',
+    Event.LATENCY_DELAYED: 'orange',
+    Event.LATENCY_OBSOLETE: 'red',
+}
+
+# CSV header -> Event lookup for the CSV export, and rows fetched per DB round-trip
+EVENT_EXPORT_COLUMNS = {
+    'event_id': 'event_id',
+    'ts_ns': 'ts_ns',
+    'sensor_node_id': 'sensor_node__name',
+    'latency_ns': 'latency_ns',
+    'bearing_deg': 'bearing_deg',
+}
+EVENT_EXPORT_CHUNK_SIZE = 2000
+
+# Sensor node filter options are refreshed at most once per this many seconds
+SENSOR_NODE_FILTER_TTL_SECONDS = 60
+SENSOR_NODE_FILTER_LIMIT = 200
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class EstimatedPaginator(Paginator):
+    """
+    Paginator that uses the PostgreSQL planner's row estimate for unfiltered
+    changelists instead of running COUNT(*) over the whole table.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if connection.vendor != 'postgresql' or query is None or query.where:
+            return super().count
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [self.object_list.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+
+        estimate = row[0] if row else 0
+        if estimate < ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+
+@lru_cache(maxsize=1)
+def _sensor_node_choices(ttl_bucket):
+    """(id, name) pairs from the sensor node lookup table, cached per TTL bucket."""
+    return tuple(
+        SensorNode.objects.values_list('id', 'name')
+        .order_by('name')[:SENSOR_NODE_FILTER_LIMIT]
+    )
+
+
+class _EchoBuffer:
+    """File-like object that hands each written CSV row straight back."""
+
+    def write(self, value):
+        return value
+
+
+class SensorNodeListFilter(admin.SimpleListFilter):
+    """Sensor node filter read from the lookup table rather than a DISTINCT scan."""
+
+    title = 'sensor node'
+    parameter_name = 'sensor_node_id'
+
+    def lookups(self, request, model_admin):
+        ttl_bucket = int(time.time() // SENSOR_NODE_FILTER_TTL_SECONDS)
+        return [(str(node_id), name) for node_id, name in _sensor_node_choices(ttl_bucket)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            try:
+                node_id = int(self.value())
+            except ValueError:
+                raise IncorrectLookupParameters(f"Invalid sensor node id: {self.value()!r}")
+            return queryset.filter(sensor_node_id=node_id)
+        return queryset
+
+
+class GccPhatMetadataInline(admin.StackedInline):
+    """Read-only GCC-PHAT metadata shown collapsed on the Event change form."""
+
+    model = GccPhatMetadata
+    can_delete = False
+    extra = 0
+    max_num = 0
+    classes = ['collapse']
+    readonly_fields = [
+        'method', 'paired_node_id', 'baseline_distance_m', 'tdoa_sec',
+        'baseline_bearing_deg'
+    ]
 
 
 @admin.register(Event)
@@ -11,22 +121,29 @@ class EventAdmin(admin.ModelAdmin):
     """Admin interface for Event model."""
 
     list_display = [
-        'event_id_short', 'sensor_type', 'sensor_node_id', 'latency_display',
+        'event_id_short', 'sensor_type', 'sensor_node', 'latency_display',
         'latency_status', 'bearing_deg', 'bearing_conf', 'duplicate_flag',
-        'object_track_id', 'created_at'
+        'object_track', 'created_at'
     ]
     list_filter = [
         'sensor_type', 'latency_status', 'validity_status', 'duplicate_flag',
-        'location_method', 'created_at'
+        'location_method'
     ]
-    search_fields = ['event_id', 'sensor_node_id', 'object_track_id']
+    date_hierarchy = 'created_at'
+    list_select_related = ('sensor_node', 'object_track')
+    paginator = EstimatedPaginator
+    show_full_result_count = False
+    search_fields = ['event_id', 'sensor_node__name', 'object_track__track_uuid']
+    raw_id_fields = ['object_track']
+    inlines = [GccPhatMetadataInline]
+    actions = ['export_csv']
     readonly_fields = [
         'event_id', 'ts_ns', 'rx_ns', 'latency_ns', 'created_at', 'updated_at',
-        'raw_wire_json', 'gcc_phat_metadata'
+        'raw_wire_json'
     ]
     fieldsets = [
         ('Identity', {
-            'fields': ['event_id', 'sensor_type', 'sensor_node_id']
+            'fields': ['event_id', 'sensor_type', 'sensor_node']
         }),
         ('Timestamps', {
             'fields': ['ts_ns', 'rx_ns', 'latency_ns', 'latency_status', 'clock_skew_ns']
@@ -35,13 +152,13 @@ class EventAdmin(admin.ModelAdmin):
             'fields': ['lat', 'lon', 'error_radius_m', 'location_method']
         }),
         ('Bearing', {
-            'fields': ['bearing_deg', 'bearing_conf', 'bearing_std_deg', 'gcc_phat_metadata']
+            'fields': ['bearing_deg', 'bearing_conf', 'bearing_std_deg']
         }),
         ('Detection', {
             'fields': ['n_objects', 'event_code', 'packet_version']
         }),
         ('Post-Processing', {
-            'fields': ['validity_status', 'duplicate_flag', 'object_track_id']
+            'fields': ['validity_status', 'duplicate_flag', 'object_track']
         }),
         ('Audit', {
             'fields': ['raw_wire_json', 'created_at', 'updated_at'],
@@ -49,27 +166,46 @@ class EventAdmin(admin.ModelAdmin):
         }),
     ]
 
+    def get_queryset(self, request):
+        """Defer the JSON blob that the changelist never displays."""
+        return super().get_queryset(request).defer('raw_wire_json').annotate(
+            _event_id_short=Concat(
+                Substr(Cast('event_id', output_field=CharField()), 1, 8), Value('...')
+            )
+        )
+
+    @admin.display(description='Event ID', ordering='event_id')
     def event_id_short(self, obj):
         """Display shortened event ID."""
-        return obj.event_id[:8] + '...'
-    event_id_short.short_description = 'Event ID'
+        return obj._event_id_short
 
+    @admin.display(description='Latency', ordering='latency_ns')
     def latency_display(self, obj):
         """Display latency in milliseconds with color coding."""
         if obj.latency_ns is None:
             return '-'
-        latency_ms = obj.latency_ms
-        if obj.latency_status == Event.LATENCY_NORMAL:
-            color = 'green'
-        elif obj.latency_status == Event.LATENCY_DELAYED:
-            color = 'orange'
-        else:
-            color = 'red'
-        return format_html(
-            '<span style="color: {};">{:.2f} ms</span>',
-            color, latency_ms
+        # Color and number are both server-controlled, so no escaping is needed
+        color = LATENCY_STATUS_COLORS.get(obj.latency_status, 'red')
+        return mark_safe(
+            f'<span style="color: {color};">{obj.latency_ns / 1_000_000:.2f} ms</span>'
         )
-    latency_display.short_description = 'Latency'
+
+    @admin.action(description='Export selected events to CSV')
+    def export_csv(self, request, queryset):
+        """Stream selected events as CSV without caching the whole queryset."""
+        writer = csv.writer(_EchoBuffer())
+        rows = queryset.values_list(*EVENT_EXPORT_COLUMNS.values()).iterator(
+            chunk_size=EVENT_EXPORT_CHUNK_SIZE
+        )
+
+        def stream():
+            yield writer.writerow(list(EVENT_EXPORT_COLUMNS))
+            for row in rows:
+                yield writer.writerow(row)
+
+        response = StreamingHttpResponse(stream(), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="events.csv"'
+        return response
 
     def has_add_permission(self, request):
         """Disable manual event creation (events come from API)."""
@@ -81,16 +217,16 @@ class TrackAdmin(admin.ModelAdmin):
     """Admin interface for Track model."""
 
     list_display = [
-        'track_id', 'method', 'status', 'contributor_count',
+        'track_uuid', 'method', 'status', 'contributor_count',
         'aggregated_bearing_deg', 'aggregation_conf', 'duration_display',
         'created_at', 'updated_at'
     ]
     list_filter = ['method', 'status', 'created_at']
-    search_fields = ['track_id']
-    readonly_fields = ['track_id', 'created_at', 'updated_at', 'duration_display']
+    search_fields = ['track_uuid']
+    readonly_fields = ['track_uuid', 'created_at', 'updated_at', 'duration_display']
     fieldsets = [
         ('Identity', {
-            'fields': ['track_id', 'method', 'status']
+            'fields': ['track_uuid', 'method', 'status']
         }),
         ('Time Range', {
             'fields': ['first_ts_ns', 'last_ts_ns', 'duration_display']
@@ -107,29 +243,47 @@ class TrackAdmin(admin.ModelAdmin):
     ]
     inlines = []
 
+    def get_queryset(self, request):
+        """Annotate contributor counts so the changelist doesn't query per row."""
+        return super().get_queryset(request).annotate(_contrib_count=Count('contributors'))
+
+    @admin.display(description='Contributors', ordering='_contrib_count')
     def contributor_count(self, obj):
         """Display number of contributing events."""
-        return obj.contributors.count()
-    contributor_count.short_description = 'Contributors'
+        return obj._contrib_count
 
+    @admin.display(description='Duration')
     def duration_display(self, obj):
         """Display track duration in seconds."""
         duration = obj.duration_seconds
         if duration is None:
             return '-'
         return f"{duration:.2f} s"
-    duration_display.short_description = 'Duration'
 
 
 @admin.register(TrackContributor)
 class TrackContributorAdmin(admin.ModelAdmin):
     """Admin interface for TrackContributor model."""
 
-    list_display = ['track', 'event', 'sensor_node_id', 'bearing_deg', 'ts_ns']
-    list_filter = ['sensor_node_id']
-    search_fields = ['track__track_id', 'event__event_id', 'sensor_node_id']
-    readonly_fields = ['track', 'event', 'sensor_node_id', 'bearing_deg', 'ts_ns']
+    list_display = ['track', 'event', 'sensor_node', 'bearing_deg', 'ts_ns']
+    list_filter = [SensorNodeListFilter]
+    list_select_related = ('track', 'event', 'sensor_node', 'event__sensor_node')
+    search_fields = ['track__track_uuid', 'event__event_id', 'sensor_node__name']
+    readonly_fields = ['track', 'event', 'sensor_node', 'bearing_deg', 'ts_ns']
+
+    def get_queryset(self, request):
+        """Skip the joined event's JSON blob; only its __str__ fields are rendered."""
+        return super().get_queryset(request).defer('event__raw_wire_json')
 
     def has_add_permission(self, request):
         """Disable manual contributor creation."""
         return False
+
+
+@admin.register(SensorNode, EventCode)
+class LookupTableAdmin(admin.ModelAdmin):
+    """Admin interface for the sensor node and event code lookup tables."""
+
+    list_display = ['id', 'name']
+    search_fields = ['name']
+    ordering = ['name']
@@ -31,7 +31,7 @@ class Command(BaseCommand):
 
         # Collect static files
         self.stdout.write('Collecting static files...')
-        call_command('collectstatic', '--noinput', '--clear')
+        call_command('collectstatic', '--noinput')
 
         self.stdout.write(self.style.SUCCESS('\nEchoShield setup complete!'))
         self.stdout.write(self.style.WARNING('\nNext steps:'))
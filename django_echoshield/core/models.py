@@ -3,10 +3,89 @@ Core Django models for EchoShield.
 
 Converted from SQLite schema to Django ORM models.
 """
+from datetime import datetime, timedelta, timezone
 from django.db import models
-from django.utils import timezone
+from django.utils.functional import cached_property
 import uuid
 
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class RoughDateTimeField(models.DateTimeField):
+    """
+    DateTimeField truncated to whole minutes on save.
+
+    Audit timestamps are only displayed and filtered at minute granularity,
+    so dropping seconds keeps the index key space small.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if value is not None:
+            value = value.replace(second=0, microsecond=0)
+            setattr(model_instance, self.attname, value)
+        return value
+
+
+class LookupTable(models.Model):
+    """
+    Small table of distinct string values referenced by integer key.
+
+    Low-cardinality strings repeated on every Event row are stored once here,
+    so rows and indexes carry a 2-byte key instead of the string.
+    """
+
+    id = models.SmallAutoField(primary_key=True)
+    name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def resolve_ids(cls, names):
+        """
+        Map names to primary keys, inserting any that don't exist yet.
+
+        Args:
+            names: Iterable of names; empty values are ignored
+
+        Returns:
+            Dictionary mapping name -> primary key
+        """
+        names = {name for name in names if name}
+        if not names:
+            return {}
+
+        ids = dict(cls.objects.filter(name__in=names).values_list('name', 'id'))
+        missing = names - ids.keys()
+        if missing:
+            cls.objects.bulk_create([cls(name=name) for name in missing], ignore_conflicts=True)
+            ids.update(cls.objects.filter(name__in=missing).values_list('name', 'id'))
+        return ids
+
+
+class SensorNode(LookupTable):
+    """Edge node identifier, as reported in WirePacket.sensor_node_id."""
+
+    class Meta:
+        db_table = 'sensor_nodes'
+        verbose_name = 'Sensor Node'
+        verbose_name_plural = 'Sensor Nodes'
+
+
+class EventCode(LookupTable):
+    """Detection event type code, as reported in WirePacket.event_code."""
+
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        db_table = 'event_codes'
+        verbose_name = 'Event Code'
+        verbose_name_plural = 'Event Codes'
+
 
 class Event(models.Model):
     """
@@ -56,14 +135,14 @@ class Event(models.Model):
     id = models.BigAutoField(primary_key=True)
 
     # Core Event Identity
-    event_id = models.CharField(max_length=255, unique=True, db_index=True,
-                                 default=uuid.uuid4, editable=False)
+    event_id = models.UUIDField(unique=True, default=uuid.uuid4, editable=False)
     sensor_type = models.CharField(max_length=20, choices=SENSOR_TYPE_CHOICES)
-    sensor_node_id = models.CharField(max_length=255, db_index=True, null=True, blank=True)
+    sensor_node = models.ForeignKey(SensorNode, on_delete=models.PROTECT, null=True, blank=True,
+                                    db_index=False, related_name='events')
 
     # Timestamps (nanoseconds - using BigInteger for precision)
-    ts_ns = models.BigIntegerField(db_index=True, help_text="Detection timestamp (nanoseconds)")
-    rx_ns = models.BigIntegerField(db_index=True, help_text="Server receipt timestamp (nanoseconds)")
+    ts_ns = models.BigIntegerField(help_text="Detection timestamp (nanoseconds)")
+    rx_ns = models.BigIntegerField(help_text="Server receipt timestamp (nanoseconds)")
     latency_ns = models.BigIntegerField(help_text="Latency: rx_ns - ts_ns (nanoseconds)")
     latency_status = models.CharField(max_length=20, choices=LATENCY_STATUS_CHOICES)
     clock_skew_ns = models.BigIntegerField(null=True, blank=True,
@@ -82,7 +161,9 @@ class Event(models.Model):
 
     # Detection Details
     n_objects = models.IntegerField(null=True, blank=True, help_text="Number of objects detected")
-    event_code = models.CharField(max_length=50, null=True, blank=True, help_text="Event type code")
+    event_code = models.ForeignKey(EventCode, on_delete=models.PROTECT, null=True, blank=True,
+                                   db_index=False, related_name='events',
+                                   help_text="Event type code")
     location_method = models.CharField(max_length=50, choices=LOCATION_METHOD_CHOICES,
                                        null=True, blank=True)
     packet_version = models.IntegerField(null=True, blank=True)
@@ -91,40 +172,70 @@ class Event(models.Model):
     validity_status = models.CharField(max_length=20, choices=VALIDITY_STATUS_CHOICES,
                                        default=VALIDITY_UNKNOWN)
     duplicate_flag = models.BooleanField(default=False, help_text="Is this a duplicate event?")
-    object_track_id = models.CharField(max_length=255, db_index=True, null=True, blank=True,
-                                       help_text="FK to Track")
-
-    # GCC-PHAT Metadata (stored as JSON)
-    gcc_phat_metadata = models.JSONField(null=True, blank=True,
-                                        help_text="GCC-PHAT bearing estimation metadata")
+    object_track = models.ForeignKey('Track', on_delete=models.SET_NULL, null=True, blank=True,
+                                     db_column='object_track_id', db_index=False,
+                                     related_name='events',
+                                     help_text="Track this event was aggregated into")
 
     # Audit
     raw_wire_json = models.JSONField(help_text="Original WirePacket JSON")
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    created_at = RoughDateTimeField(auto_now_add=True, db_index=True)
+    updated_at = RoughDateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'events'
         ordering = ['-rx_ns']
         indexes = [
-            models.Index(fields=['sensor_node_id', 'ts_ns'], name='idx_node_ts'),
-            models.Index(fields=['object_track_id'], name='idx_track'),
+            models.Index(fields=['sensor_node', 'ts_ns'], name='idx_node_ts'),
+            models.Index(fields=['object_track'], name='idx_track'),
+            # Admin changelist: filter on status/duplicate flag, order by -rx_ns
+            models.Index(fields=['-rx_ns'], name='idx_event_rx_desc'),
+            models.Index(fields=['latency_status', '-rx_ns'], name='idx_event_lat_rx'),
+            models.Index(fields=['duplicate_flag', '-rx_ns'], name='idx_event_nondup_rx',
+                         condition=models.Q(duplicate_flag=False)),
+            # Dashboard: recent events per node / per validity status
+            models.Index(fields=['sensor_node', '-rx_ns'], name='idx_node_rx_desc'),
+            models.Index(fields=['validity_status', '-rx_ns'], name='idx_valid_rx'),
         ]
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
 
     def __str__(self):
-        return f"Event {self.event_id[:8]} - {self.sensor_type} @ {self.sensor_node_id}"
+        return f"Event {str(self.event_id)[:8]} - {self.sensor_type} @ node {self.sensor_node}"
 
     @property
     def latency_ms(self):
         """Return latency in milliseconds for display."""
         return self.latency_ns / 1_000_000 if self.latency_ns else None
 
-    @property
+    @cached_property
     def timestamp_datetime(self):
         """Convert ts_ns to datetime object."""
-        return timezone.datetime.fromtimestamp(self.ts_ns / 1_000_000_000, tz=timezone.utc)
+        secs, nanos = divmod(self.ts_ns, 1_000_000_000)
+        return UNIX_EPOCH + timedelta(seconds=secs, microseconds=nanos // 1000)
+
+
+class GccPhatMetadata(models.Model):
+    """
+    GCC-PHAT bearing estimation metadata.
+    Stored as typed columns alongside the event it was computed for.
+    """
+
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True,
+                                 related_name='gcc_phat', db_column='event_id')
+    method = models.CharField(max_length=50, default='GCC_PHAT_TDOA')
+    paired_node_id = models.CharField(max_length=255)
+    baseline_distance_m = models.FloatField(help_text="Distance to paired node (meters)")
+    tdoa_sec = models.FloatField(help_text="Time difference of arrival (seconds)")
+    baseline_bearing_deg = models.FloatField(help_text="Bearing to paired node (degrees)")
+
+    class Meta:
+        db_table = 'gcc_phat_metadata'
+        verbose_name = 'GCC-PHAT Metadata'
+        verbose_name_plural = 'GCC-PHAT Metadata'
+
+    def __str__(self):
+        return f"GCC-PHAT {self.method} paired with {self.paired_node_id}"
 
 
 class Track(models.Model):
@@ -150,7 +261,10 @@ class Track(models.Model):
     ]
 
     # Primary Key
-    track_id = models.CharField(max_length=255, primary_key=True)
+    id = models.BigAutoField(primary_key=True)
+
+    # Public identifier
+    track_uuid = models.UUIDField(unique=True, default=uuid.uuid4, editable=False)
 
     # Method
     method = models.CharField(max_length=50, choices=METHOD_CHOICES, null=True, blank=True)
@@ -174,20 +288,21 @@ class Track(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_ACTIVE)
 
     # Audit
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    created_at = RoughDateTimeField(auto_now_add=True)
+    updated_at = RoughDateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'tracks'
         ordering = ['-last_ts_ns']
         indexes = [
-            models.Index(fields=['last_ts_ns'], name='idx_last_ts'),
+            # Active-track listing and expiry sweep; last_ts_ns alone is db_index'd
+            models.Index(fields=['status', '-last_ts_ns'], name='idx_status_last_ts'),
         ]
         verbose_name = 'Track'
         verbose_name_plural = 'Tracks'
 
     def __str__(self):
-        return f"Track {self.track_id} - {self.status}"
+        return f"Track {self.track_uuid} - {self.status}"
 
     @property
     def duration_ns(self):
@@ -201,6 +316,15 @@ class Track(models.Model):
         return duration / 1_000_000_000 if duration else None
 
 
+class TrackContributorManager(models.Manager):
+    """Always join the linked Track, Event and node names; every contributor display uses them."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'track', 'event', 'sensor_node', 'event__sensor_node'
+        )
+
+
 class TrackContributor(models.Model):
     """
     Multi-node detection links.
@@ -214,15 +338,43 @@ class TrackContributor(models.Model):
                               db_column='event_id')
 
     # Contributor details
-    sensor_node_id = models.CharField(max_length=255)
+    sensor_node = models.ForeignKey(SensorNode, on_delete=models.PROTECT, db_index=False,
+                                    related_name='track_contributions')
     bearing_deg = models.FloatField(null=True, blank=True)
     ts_ns = models.BigIntegerField()
 
+    objects = TrackContributorManager()
+
     class Meta:
         db_table = 'track_contributors'
+        base_manager_name = 'objects'
         unique_together = ['track', 'event']
+        indexes = [
+            models.Index(fields=['sensor_node', 'ts_ns'], name='idx_contrib_node_ts'),
+        ]
         verbose_name = 'Track Contributor'
         verbose_name_plural = 'Track Contributors'
 
     def __str__(self):
-        return f"Contributor {self.sensor_node_id} to {self.track.track_id}"
+        return f"Contributor node {self.sensor_node} to {self.track.track_uuid}"
+
+    @classmethod
+    def bulk_upsert(cls, rows, batch_size=1000):
+        """
+        Insert contributor rows, updating existing (track, event) links in place.
+
+        Args:
+            rows: Iterable of field dictionaries (track, event, sensor_node_id,
+                bearing_deg, ts_ns)
+            batch_size: Maximum rows per INSERT statement
+
+        Returns:
+            List of TrackContributor instances
+        """
+        return cls.objects.bulk_create(
+            [cls(**row) for row in rows],
+            update_conflicts=True,
+            unique_fields=['track', 'event'],
+            update_fields=['sensor_node', 'bearing_deg', 'ts_ns'],
+            batch_size=batch_size
+        )
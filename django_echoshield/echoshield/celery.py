@@ -17,14 +17,11 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 # Celery Beat schedule for periodic tasks
+# (deduplication and track aggregation are triggered by flush_event_buffer)
 app.conf.beat_schedule = {
-    'aggregate-tracks-every-30-seconds': {
-        'task': 'monitoring.tasks.aggregate_tracks',
-        'schedule': 30.0,  # Run every 30 seconds
-    },
-    'deduplicate-events-every-minute': {
-        'task': 'monitoring.tasks.deduplicate_events',
-        'schedule': 60.0,  # Run every minute
+    'flush-event-buffer-every-2-seconds': {
+        'task': 'monitoring.tasks.flush_event_buffer',
+        'schedule': 2.0,  # Run every 2 seconds
     },
     'cleanup-expired-tracks-every-5-minutes': {
         'task': 'monitoring.tasks.cleanup_expired_tracks',
@@ -0,0 +1,62 @@
+"""
+Non-blocking file logging for EchoShield.
+
+Request threads only format the record and put it on an in-memory queue;
+a background QueueListener thread performs the actual file writes.
+"""
+import atexit
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    QueueHandler that owns a rotating file writer running on a listener thread.
+
+    Configure it from LOGGING with ``'()': 'echoshield.logging_queue.QueuedFileHandler'``;
+    the configured formatter is applied before the record is enqueued.
+
+    The listener is started by the first record each process emits: threads
+    don't survive fork, so Celery prefork children need their own.
+    """
+
+    def __init__(self, filename, max_bytes=100_000_000, backup_count=5):
+        super().__init__(queue.SimpleQueue())
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.listener = None
+        self._listener_pid = None
+        atexit.register(self._stop_listener)
+
+    def _start_listener(self):
+        # Marked as started even if the file can't be opened, so a broken log
+        # path is reported once per process rather than on every record
+        self._listener_pid = os.getpid()
+        self.listener = None
+        # A fresh queue, so a child doesn't rewrite records copied from its parent
+        self.queue = queue.SimpleQueue()
+        file_handler = RotatingFileHandler(
+            self.filename, maxBytes=self.max_bytes, backupCount=self.backup_count
+        )
+        self.listener = QueueListener(self.queue, file_handler)
+        self.listener.start()
+
+    def _stop_listener(self):
+        # A forked child must not stop the listener it inherited from its parent
+        if self._listener_pid == os.getpid() and self.listener is not None:
+            self.listener.stop()
+            self._listener_pid = None
+
+    def emit(self, record):
+        # Called with the handler lock held, so only one thread starts the listener
+        if self._listener_pid != os.getpid():
+            try:
+                self._start_listener()
+            except Exception:
+                self.handleError(record)
+        if self.listener is None:
+            # No writer in this process; don't queue records nobody reads
+            return
+        super().emit(record)
@@ -0,0 +1,23 @@
+"""
+REST Framework renderers for EchoShield.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Types orjson can't encode natively (e.g. Decimal, lazy translation strings)
+    fall back to REST Framework's JSON encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS
+        )
@@ -93,6 +93,12 @@ if env('USE_POSTGRES', default=False):
         'PASSWORD': env('POSTGRES_PASSWORD', default=''),
         'HOST': env('POSTGRES_HOST', default='localhost'),
         'PORT': env('POSTGRES_PORT', default='5432'),
+        # Reuse connections across requests instead of reconnecting each time
+        'CONN_MAX_AGE': env.int('POSTGRES_CONN_MAX_AGE', default=600),
+        'CONN_HEALTH_CHECKS': True,
+        # Required when HOST/PORT point at PgBouncer in transaction pooling mode
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('POSTGRES_DISABLE_SERVER_SIDE_CURSORS',
+                                                default=False),
     }
 
 # Password validation
@@ -110,7 +116,10 @@ USE_I18N = True
 USE_TZ = True
 
 # Static files (CSS, JavaScript, Images)
-STATIC_URL = '/static/'
+# Set STATIC_HOST to a CDN origin-pull domain in production; WhiteNoise then only
+# serves the CDN's cache misses, with far-future headers on hashed files.
+STATIC_HOST = env('STATIC_HOST', default='')
+STATIC_URL = STATIC_HOST + '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
@@ -125,7 +134,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'echoshield.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -166,6 +175,11 @@ ECHOSHIELD = {
     'DEDUP_BEARING_DELTA_DEG': env.float('DEDUP_BEARING_DELTA_DEG', default=20.0),
     'LATENCY_NORMAL_NS': env.int('LATENCY_NORMAL_NS', default=500_000_000),
     'LATENCY_DELAYED_NS': env.int('LATENCY_DELAYED_NS', default=2_000_000_000),
+    'EVENT_BUFFER_REDIS_URL': env('EVENT_BUFFER_REDIS_URL', default=CELERY_BROKER_URL),
+    'EVENT_BUFFER_KEY': env('EVENT_BUFFER_KEY', default='echoshield:event_buffer'),
+    'EVENT_BUFFER_BATCH_SIZE': env.int('EVENT_BUFFER_BATCH_SIZE', default=10_000),
+    'EVENT_BUFFER_MAX_ATTEMPTS': env.int('EVENT_BUFFER_MAX_ATTEMPTS', default=3),
+    'EVENT_BUFFER_LOCK_TIMEOUT_S': env.int('EVENT_BUFFER_LOCK_TIMEOUT_S', default=300),
 }
 
 # Logging
@@ -184,7 +198,8 @@ LOGGING = {
             'formatter': 'verbose',
         },
         'file': {
-            'class': 'logging.FileHandler',
+            # Writes happen on a background thread, off the request path
+            '()': 'echoshield.logging_queue.QueuedFileHandler',
             'filename': BASE_DIR / 'logs' / 'echoshield.log',
             'formatter': 'verbose',
         },
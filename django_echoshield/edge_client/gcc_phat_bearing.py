@@ -15,6 +15,9 @@ from typing import Dict, List, Optional, Any
 from django.conf import settings
 from .node_registry import haversine_distance, calculate_bearing_from_coords
 
+# Resolved once at import; changing ECHOSHIELD['SPEED_OF_SOUND'] needs a restart
+SPEED_OF_SOUND = settings.ECHOSHIELD.get('SPEED_OF_SOUND', 343.0)
+
 
 def tdoa_to_bearing(tau: float, node1_lat: float, node1_lon: float,
                     node2_lat: float, node2_lon: float,
@@ -35,33 +38,27 @@ def tdoa_to_bearing(tau: float, node1_lat: float, node1_lon: float,
     baseline_distance = haversine_distance(node1_lat, node1_lon, node2_lat, node2_lon)
     baseline_bearing = calculate_bearing_from_coords(node1_lat, node1_lon, node2_lat, node2_lon)
 
-    # Convert TDOA to distance difference
-    distance_diff = tau * speed_of_sound
+    # Calculate angle using hyperbolic geometry
+    # cos(theta) = distance_diff / baseline_distance, distance_diff = tau * c
+    cos_theta = tau * speed_of_sound / baseline_distance
 
     # Check if distance difference is physically possible
-    if abs(distance_diff) > baseline_distance:
-        # Clamp to baseline distance
-        distance_diff = math.copysign(baseline_distance * 0.95, distance_diff)
-
-    # Calculate angle using hyperbolic geometry
-    # cos(theta) = distance_diff / baseline_distance
-    cos_theta = distance_diff / baseline_distance
-    cos_theta = max(-1.0, min(1.0, cos_theta))  # Clamp to [-1, 1]
+    if abs(cos_theta) > 1.0:
+        # Clamp to just inside the baseline distance
+        cos_theta = math.copysign(0.95, cos_theta)
 
-    theta_rad = math.acos(abs(cos_theta))
-    theta_deg = math.degrees(theta_rad)
+    theta_deg = math.degrees(math.acos(abs(cos_theta)))
 
     # Determine bearing relative to baseline
     # If tau > 0, sound arrived at node2 first, source is on node2's side
-    if distance_diff > 0:
-        bearing_deg = (baseline_bearing + 90 - theta_deg) % 360
-    else:
-        bearing_deg = (baseline_bearing + 90 + theta_deg) % 360
+    side = -1.0 if cos_theta > 0 else 1.0
+    bearing_deg = (baseline_bearing + 90 + side * theta_deg) % 360
 
     # Calculate confidence based on geometry
     # Better confidence when nodes are perpendicular to source direction
-    # sin(theta) is high for perpendicular, low for collinear
-    geometry_factor = abs(math.sin(theta_rad))
+    # sin(theta) is high for perpendicular, low for collinear;
+    # sin(acos(x)) == sqrt(1 - x^2), so no trig call is needed
+    geometry_factor = math.sqrt(1.0 - cos_theta * cos_theta)
 
     # Base confidence adjusted by geometry (0.5 to 1.0)
     base_confidence = 0.6
@@ -79,7 +76,8 @@ def estimate_bearing_multi_node(current_node: Dict[str, Any],
 
     Args:
         current_node: Dictionary with 'node_id', 'lat', 'lon', 'ts_ns'
-        nearby_nodes: List of nearby node dictionaries with detection timestamps
+        nearby_nodes: List of nearby node dictionaries with detection timestamps,
+            sorted closest first (as returned by NodeRegistry.get_nearby_nodes)
         detection_ts_ns: Current detection timestamp (nanoseconds)
         speed_of_sound: Speed of sound in m/s (default from settings)
 
@@ -91,11 +89,11 @@ def estimate_bearing_multi_node(current_node: Dict[str, Any],
 
     # Get speed of sound from settings
     if speed_of_sound is None:
-        speed_of_sound = settings.ECHOSHIELD.get('SPEED_OF_SOUND', 343.0)
+        speed_of_sound = SPEED_OF_SOUND
 
-    # Select the closest paired node
+    # Select the closest paired node; nearby_nodes is already sorted by distance
     # In production, you might want to try multiple nodes and average results
-    paired_node = min(nearby_nodes, key=lambda n: n.get('distance_m', float('inf')))
+    paired_node = nearby_nodes[0]
 
     # Get timestamps for TDOA calculation
     # In this implementation, we use the timestamp difference between nodes
@@ -7,7 +7,7 @@ into the compact WirePacket wire protocol format.
 import uuid
 from typing import Dict, Any, Optional
 from django.conf import settings
-from .node_registry import get_registry
+from .node_registry import get_registry, quantize_coord
 from .gcc_phat_bearing import estimate_bearing_multi_node
 
 
@@ -97,8 +97,8 @@ def to_wirepacket(payload: Dict[str, Any]) -> Dict[str, Any]:
         "ts_ns": ts_ns,
         "sensor_node_id": node_id,
         "location": {
-            "lat_int": int(lat * 1e5) if lat is not None else 0,
-            "lon_int": int(lon * 1e5) if lon is not None else 0,
+            "lat_int": quantize_coord(lat) if lat is not None else 0,
+            "lon_int": quantize_coord(lon) if lon is not None else 0,
             "error_radius_m": int(acc_m)
         },
         "bearing_deg": int(bearing_deg * 100) if bearing_deg is not None else None,
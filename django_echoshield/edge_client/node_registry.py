@@ -8,10 +8,35 @@ This is an in-memory registry that tracks:
 """
 import time
 import math
-from collections import defaultdict
-from typing import Dict, List, Optional, Any
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from functools import wraps
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple
+import numpy as np
 from django.conf import settings
 
+EARTH_RADIUS_M = 6371000  # Earth radius in meters
+METERS_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180  # Along a meridian
+
+# Registry coordinates are held at the WirePacket location resolution:
+# integer multiples of 1e-5 degrees (see quantize_coord)
+COORD_SCALE = 100_000
+
+
+def quantize_coord(value: float) -> int:
+    """
+    Convert decimal degrees to the WirePacket fixed-point integer form.
+
+    Args:
+        value: Latitude or longitude (decimal degrees)
+
+    Returns:
+        value * 1e5, rounded to the nearest integer (truncating would turn
+        float error such as 0.00029 * 1e5 == 28.999... into 28)
+    """
+    return round(value * COORD_SCALE)
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -24,7 +49,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distance in meters
     """
-    R = 6371000  # Earth radius in meters
+    R = EARTH_RADIUS_M
 
     lat1_rad = math.radians(lat1)
     lat2_rad = math.radians(lat2)
@@ -63,22 +88,103 @@ def calculate_bearing_from_coords(lat1: float, lon1: float, lat2: float, lon2: f
     return bearing_deg
 
 
+def haversine_distances(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Vectorized haversine_distance from one point to many points.
+
+    Args:
+        lat, lon: Reference point (decimal degrees)
+        lats, lons: Arrays of target coordinates (decimal degrees)
+
+    Returns:
+        Array of distances in meters
+    """
+    lat_rad = math.radians(lat)
+    lats_rad = np.radians(lats)
+    dlat = lats_rad - lat_rad
+    dlon = np.radians(lons - lon)
+
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat_rad) * np.cos(lats_rad) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_M * c
+
+
+def bearings_from_coords(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_bearing_from_coords from one point to many points.
+
+    Args:
+        lat, lon: Starting point (decimal degrees)
+        lats, lons: Arrays of end points (decimal degrees)
+
+    Returns:
+        Array of bearings in degrees (0-360, where 0 is North)
+    """
+    lat_rad = math.radians(lat)
+    lats_rad = np.radians(lats)
+    dlon_rad = np.radians(lons - lon)
+
+    x = np.sin(dlon_rad) * np.cos(lats_rad)
+    y = (math.cos(lat_rad) * np.sin(lats_rad) -
+         math.sin(lat_rad) * np.cos(lats_rad) * np.cos(dlon_rad))
+
+    return (np.degrees(np.arctan2(x, y)) + 360) % 360
+
+
+def _synchronized(method):
+    """Run a NodeRegistry method while holding the registry lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class NodeRegistry:
     """
     In-memory registry for tracking active edge nodes and their detections.
     """
 
-    def __init__(self, retention_seconds: int = 60):
+    def __init__(self, retention_seconds: int = 60, cell_size_m: float = 100.0):
         """
         Initialize the node registry.
 
         Args:
             retention_seconds: How long to keep nodes/detections before cleanup
+            cell_size_m: Grid cell edge used to index nodes for nearby-node
+                queries; best set to the usual query radius
         """
         self.retention_seconds = retention_seconds
+        # Webhooks build WirePackets in worker threads, so every public
+        # method runs under this lock
+        self._lock = threading.RLock()
         self.nodes: Dict[str, Dict[str, Any]] = {}
-        self.detections: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-
+        self.detections: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+
+        # All detections sorted by ts_ns for window queries (parallel lists),
+        # and in arrival order for expiry
+        self._detection_ts: List[int] = []
+        self._detections_by_ts: List[Dict[str, Any]] = []
+        self._detection_arrivals: Deque[Dict[str, Any]] = deque()
+
+        # Quantized node coordinates (see quantize_coord) as parallel arrays for
+        # vectorized distance queries; row i holds the node self._node_ids[i]
+        self._node_ids: List[str] = []
+        self._node_rows: Dict[str, int] = {}
+        self._lat_ints = np.empty(16, dtype=np.int32)
+        self._lon_ints = np.empty(16, dtype=np.int32)
+
+        # Lat/lon grid index: (lat_cell, lon_cell) -> node IDs in that cell
+        self._cell_deg = cell_size_m / METERS_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        self._node_cells: Dict[str, Tuple[int, int]] = {}
+
+        # (node_id, radius) -> [(other_id, distance_m, bearing_to_node), ...];
+        # cleared whenever a node joins, leaves or moves
+        self._nearby_cache: Dict[Tuple[str, float], List[Tuple[str, float, float]]] = {}
+
+    @_synchronized
     def register_node(self, node_id: str, lat: float, lon: float, accuracy_m: float = 50.0):
         """
         Register or update a node in the registry.
@@ -97,6 +203,33 @@ class NodeRegistry:
             'last_seen': time.time()
         }
 
+        lat_int, lon_int = quantize_coord(lat), quantize_coord(lon)
+        row = self._node_rows.get(node_id)
+        if row is None:
+            row = len(self._node_ids)
+            if row == len(self._lat_ints):
+                self._lat_ints = np.resize(self._lat_ints, 2 * row)
+                self._lon_ints = np.resize(self._lon_ints, 2 * row)
+            self._node_ids.append(node_id)
+            self._node_rows[node_id] = row
+            moved = True
+        else:
+            # Moves below the coordinate resolution keep cached geometry
+            moved = lat_int != self._lat_ints[row] or lon_int != self._lon_ints[row]
+        self._lat_ints[row] = lat_int
+        self._lon_ints[row] = lon_int
+        if moved:
+            self._nearby_cache.clear()
+
+        cell = self._cell_of(lat_int / COORD_SCALE, lon_int / COORD_SCALE)
+        old_cell = self._node_cells.get(node_id)
+        if cell != old_cell:
+            if old_cell is not None:
+                self._remove_from_cell(node_id, old_cell)
+            self._cells[cell].add(node_id)
+            self._node_cells[node_id] = cell
+
+    @_synchronized
     def add_detection(self, node_id: str, event_id: str, ts_ns: int, confidence: float,
                       lat: float, lon: float):
         """
@@ -120,8 +253,15 @@ class NodeRegistry:
             'lon': lon
         }
         self.detections[node_id].append(detection)
+        self._detection_arrivals.append(detection)
+
+        index = bisect_right(self._detection_ts, ts_ns)
+        self._detection_ts.insert(index, ts_ns)
+        self._detections_by_ts.insert(index, detection)
+
         self._cleanup()
 
+    @_synchronized
     def get_nearby_nodes(self, node_id: str, max_radius_m: float = 100.0) -> List[Dict[str, Any]]:
         """
         Get all nodes within a certain radius of the specified node.
@@ -136,34 +276,139 @@ class NodeRegistry:
         if node_id not in self.nodes:
             return []
 
-        current_node = self.nodes[node_id]
-        nearby = []
+        key = (node_id, max_radius_m)
+        neighbors = self._nearby_cache.get(key)
+        if neighbors is None:
+            neighbors = self._nearby_cache[key] = self._nearby_geometry(node_id, max_radius_m)
 
-        for other_id, other_node in self.nodes.items():
-            if other_id == node_id:
-                continue
+        return [
+            {
+                **self.nodes[other_id],
+                'distance_m': distance_m,
+                'bearing_to_node': bearing_to_node
+            }
+            for other_id, distance_m, bearing_to_node in neighbors
+        ]
 
-            distance_m = haversine_distance(
-                current_node['lat'], current_node['lon'],
-                other_node['lat'], other_node['lon']
-            )
+    def _nearby_geometry(self, node_id: str, max_radius_m: float) -> List[Tuple[str, float, float]]:
+        """
+        Distances and bearings from a node to every node within a radius.
 
-            if distance_m <= max_radius_m:
-                bearing_to_node = calculate_bearing_from_coords(
-                    current_node['lat'], current_node['lon'],
-                    other_node['lat'], other_node['lon']
-                )
+        Args:
+            node_id: The reference node
+            max_radius_m: Maximum radius in meters
 
-                nearby.append({
-                    **other_node,
-                    'distance_m': distance_m,
-                    'bearing_to_node': bearing_to_node
-                })
+        Returns:
+            List of (other_id, distance_m, bearing_to_node), closest first
+        """
+        node_row = self._node_rows[node_id]
+        lat_int, lon_int = int(self._lat_ints[node_row]), int(self._lon_ints[node_row])
+        lat, lon = lat_int / COORD_SCALE, lon_int / COORD_SCALE
+
+        # Candidates from the grid index, then exact distances in one pass;
+        # the node itself is excluded
+        rows = self._candidate_rows(lat, lon, max_radius_m)
+        rows = rows[rows != node_row]
+        rows = self._prefilter_rows(rows, lat_int, lon_int, max_radius_m)
+        lats = self._lat_ints[rows] / COORD_SCALE
+        lons = self._lon_ints[rows] / COORD_SCALE
+        distances = haversine_distances(lat, lon, lats, lons)
 
         # Sort by distance (closest first)
-        nearby.sort(key=lambda n: n['distance_m'])
-        return nearby
+        within = distances <= max_radius_m
+        order = np.argsort(distances[within], kind='stable')
+        rows, distances = rows[within][order], distances[within][order]
+        lats, lons = lats[within][order], lons[within][order]
+
+        # Bearings only for nodes within the radius
+        bearings = bearings_from_coords(lat, lon, lats, lons)
+
+        return [
+            (self._node_ids[row], float(distance_m), float(bearing_to_node))
+            for row, distance_m, bearing_to_node in zip(rows, distances, bearings)
+        ]
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Grid cell containing a coordinate."""
+        return math.floor(lat / self._cell_deg), math.floor(lon / self._cell_deg)
+
+    def _remove_from_cell(self, node_id: str, cell: Tuple[int, int]):
+        """Drop a node from a grid cell, deleting the cell once empty."""
+        members = self._cells[cell]
+        members.discard(node_id)
+        if not members:
+            del self._cells[cell]
+
+    def _prefilter_rows(self, rows: np.ndarray, lat_int: int, lon_int: int,
+                        radius_m: float) -> np.ndarray:
+        """
+        Drop rows that are clearly out of range using a flat-earth distance.
+
+        Works on the quantized coordinates directly; the east-west scale uses
+        the cosine at the poleward edge of the search circle, so the estimate
+        never exceeds the true distance by more than the 5% margin and no
+        node within radius_m is dropped.
+
+        Args:
+            rows: Candidate coordinate array rows
+            lat_int, lon_int: Center of the search circle (see quantize_coord)
+            radius_m: Search radius in meters
+
+        Returns:
+            Subset of rows that may lie within radius_m
+        """
+        poleward_lat = min(90.0, abs(lat_int / COORD_SCALE) + math.degrees(radius_m / EARTH_RADIUS_M))
+        x_scale = math.cos(math.radians(poleward_lat))
+        half_turn = 180 * COORD_SCALE
 
+        dy = self._lat_ints[rows].astype(np.int64) - lat_int
+        dx = (self._lon_ints[rows].astype(np.int64) - lon_int + half_turn) % (2 * half_turn) - half_turn
+        limit = radius_m * 1.05 * COORD_SCALE / METERS_PER_DEGREE
+
+        return rows[dy * dy + np.square(dx * x_scale) <= limit * limit]
+
+    def _candidate_rows(self, lat: float, lon: float, radius_m: float) -> np.ndarray:
+        """
+        Coordinate array rows of nodes that may lie within radius_m of a point.
+
+        Looks up only the grid cells overlapping the bounding box of the
+        search circle; falls back to every row when the box would cover more
+        cells than are occupied, or touches a pole or the antimeridian.
+
+        Args:
+            lat, lon: Center of the search circle (decimal degrees)
+            radius_m: Search radius in meters
+
+        Returns:
+            Sorted array of row indices
+        """
+        all_rows = np.arange(len(self._node_ids))
+
+        angular_radius = radius_m / EARTH_RADIUS_M
+        cos_lat = math.cos(math.radians(lat))
+        if math.sin(angular_radius) >= cos_lat:
+            return all_rows
+
+        # Widest latitude/longitude offsets of a point inside the circle
+        dlat_deg = math.degrees(angular_radius)
+        dlon_deg = math.degrees(math.asin(math.sin(angular_radius) / cos_lat))
+        if lon - dlon_deg < -180 or lon + dlon_deg > 180:
+            return all_rows
+
+        lat_lo, lon_lo = self._cell_of(lat - dlat_deg, lon - dlon_deg)
+        lat_hi, lon_hi = self._cell_of(lat + dlat_deg, lon + dlon_deg)
+        if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > len(self._cells):
+            return all_rows
+
+        rows = [
+            self._node_rows[other_id]
+            for lat_cell in range(lat_lo, lat_hi + 1)
+            for lon_cell in range(lon_lo, lon_hi + 1)
+            for other_id in self._cells.get((lat_cell, lon_cell), ())
+        ]
+        return np.sort(np.array(rows, dtype=np.intp))
+
+    @_synchronized
     def find_concurrent_detections(self, ts_ns: int, time_window_ns: int = 5_000_000_000,
                                    min_confidence: float = 0.5) -> List[Dict[str, Any]]:
         """
@@ -175,18 +420,17 @@ class NodeRegistry:
             min_confidence: Minimum confidence threshold
 
         Returns:
-            List of concurrent detections
+            List of concurrent detections, ordered by ts_ns
         """
-        concurrent = []
-
-        for node_id, detections in self.detections.items():
-            for det in detections:
-                if (abs(det['ts_ns'] - ts_ns) <= time_window_ns and
-                        det['confidence'] >= min_confidence):
-                    concurrent.append(det)
+        lo = bisect_left(self._detection_ts, ts_ns - time_window_ns)
+        hi = bisect_right(self._detection_ts, ts_ns + time_window_ns)
 
-        return concurrent
+        return [
+            det for det in self._detections_by_ts[lo:hi]
+            if det['confidence'] >= min_confidence
+        ]
 
+    @_synchronized
     def get_node_status(self) -> Dict[str, Any]:
         """
         Get registry status information.
@@ -195,7 +439,7 @@ class NodeRegistry:
             Dictionary with registry statistics
         """
         total_nodes = len(self.nodes)
-        total_detections = sum(len(dets) for dets in self.detections.values())
+        total_detections = len(self._detections_by_ts)
 
         return {
             'total_nodes': total_nodes,
@@ -218,20 +462,47 @@ class NodeRegistry:
         ]
         for node_id in stale_nodes:
             del self.nodes[node_id]
-
-        # Remove stale detections
-        for node_id in list(self.detections.keys()):
-            self.detections[node_id] = [
-                det for det in self.detections[node_id]
-                if det['timestamp'] >= cutoff_time
-            ]
+            self._remove_from_cell(node_id, self._node_cells.pop(node_id))
+        if stale_nodes:
+            self._rebuild_coordinate_arrays()
+            self._nearby_cache.clear()
+
+        # Remove stale detections; they arrive in timestamp order, so the
+        # expired ones are always at the head of each queue
+        arrivals = self._detection_arrivals
+        while arrivals and arrivals[0]['timestamp'] < cutoff_time:
+            det = arrivals.popleft()
+
+            node_detections = self.detections[det['node_id']]
+            node_detections.popleft()
             # Remove empty detection lists
-            if not self.detections[node_id]:
-                del self.detections[node_id]
+            if not node_detections:
+                del self.detections[det['node_id']]
+
+            index = bisect_left(self._detection_ts, det['ts_ns'])
+            while self._detections_by_ts[index] is not det:
+                index += 1
+            del self._detection_ts[index]
+            del self._detections_by_ts[index]
+
+    def _rebuild_coordinate_arrays(self):
+        """
+        Repack the coordinate arrays from self.nodes after nodes were removed.
+        """
+        self._node_ids = list(self.nodes)
+        self._node_rows = {node_id: row for row, node_id in enumerate(self._node_ids)}
+
+        capacity = max(16, len(self._node_ids))
+        self._lat_ints = np.empty(capacity, dtype=np.int32)
+        self._lon_ints = np.empty(capacity, dtype=np.int32)
+        for row, node_id in enumerate(self._node_ids):
+            self._lat_ints[row] = quantize_coord(self.nodes[node_id]['lat'])
+            self._lon_ints[row] = quantize_coord(self.nodes[node_id]['lon'])
 
 
 # Global registry instance
 _registry: Optional[NodeRegistry] = None
+_registry_lock = threading.Lock()
 
 
 def get_registry() -> NodeRegistry:
@@ -243,8 +514,11 @@ def get_registry() -> NodeRegistry:
     """
     global _registry
     if _registry is None:
-        retention = settings.ECHOSHIELD.get('NODE_RETENTION_SECONDS', 60)
-        _registry = NodeRegistry(retention_seconds=retention)
+        with _registry_lock:
+            if _registry is None:
+                retention = settings.ECHOSHIELD.get('NODE_RETENTION_SECONDS', 60)
+                cell_size_m = settings.ECHOSHIELD.get('GCC_PHAT_MAX_RADIUS_M', 100.0)
+                _registry = NodeRegistry(retention_seconds=retention, cell_size_m=cell_size_m)
     return _registry
 
 
@@ -7,21 +7,53 @@ Handles:
 - Node registry status endpoint
 - Static file serving for browser-based detection UI
 """
+import asyncio
+import atexit
 import logging
+import threading
+from typing import Optional
 import httpx
+import orjson
 from django.conf import settings
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.views import View
 from django.utils.decorators import method_decorator
-import json
 
 from .mappers import to_wirepacket, wirepacket_to_dict
 from .node_registry import get_registry
 
 logger = logging.getLogger(__name__)
 
+# Global HTTP client for forwarding to the ingest API
+_ingest_client: Optional[httpx.Client] = None
+_ingest_client_lock = threading.Lock()
+
+
+def get_ingest_client() -> httpx.Client:
+    """
+    Get the pooled HTTP client used to forward WirePackets (singleton pattern).
+
+    A thread-safe sync client keeps connections to the ingest API alive across
+    requests; an AsyncClient is bound to one event loop, and under WSGI each
+    async view runs in a fresh loop.
+
+    Returns:
+        httpx.Client instance
+    """
+    global _ingest_client
+    if _ingest_client is None:
+        # Called from asyncio.to_thread workers; build exactly one client
+        with _ingest_client_lock:
+            if _ingest_client is None:
+                _ingest_client = httpx.Client(
+                    timeout=10.0,
+                    limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+                )
+                atexit.register(_ingest_client.close)
+    return _ingest_client
+
 
 @require_http_methods(["GET"])
 def health_check(request):
@@ -72,12 +104,13 @@ class WebhookEdgeView(View):
         """Handle POST request with edge detection payload."""
         try:
             # Parse JSON payload
-            payload = json.loads(request.body)
-            logger.info(f"Received edge detection: node={payload.get('nodeId')}, "
-                       f"confidence={payload.get('confidence')}")
+            payload = orjson.loads(request.body)
+            logger.info("Received edge detection: node=%s, confidence=%s",
+                        payload.get('nodeId'), payload.get('confidence'))
 
-            # Convert to WirePacket format
-            wire_packet = to_wirepacket(payload)
+            # Convert to WirePacket format; the registry work is synchronous,
+            # so keep it off the event loop
+            wire_packet = await asyncio.to_thread(to_wirepacket, payload)
 
             # Get ingest URL from settings
             ingest_url = settings.ECHOSHIELD.get(
@@ -90,20 +123,23 @@ class WebhookEdgeView(View):
             error_msg = None
 
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.post(ingest_url, json=wire_packet)
-                    response.raise_for_status()
-                    forwarded = True
-                    logger.info(f"Forwarded event {wire_packet['event_id']} to ingest API")
+                response = await asyncio.to_thread(
+                    get_ingest_client().post, ingest_url,
+                    content=orjson.dumps(wire_packet),
+                    headers={'Content-Type': 'application/json'}
+                )
+                response.raise_for_status()
+                forwarded = True
+                logger.info("Forwarded event %s to ingest API", wire_packet['event_id'])
             except httpx.HTTPError as e:
                 error_msg = str(e)
-                logger.error(f"Failed to forward to ingest API: {e}")
+                logger.error("Failed to forward to ingest API: %s", e)
             except Exception as e:
                 error_msg = str(e)
-                logger.error(f"Unexpected error forwarding to ingest API: {e}")
+                logger.error("Unexpected error forwarding to ingest API: %s", e)
 
             # Return response
-            return JsonResponse({
+            return HttpResponse(orjson.dumps({
                 'status': 'accepted' if forwarded else 'error',
                 'event_id': wire_packet['event_id'],
                 'forwarded': forwarded,
@@ -111,16 +147,18 @@ class WebhookEdgeView(View):
                 'bearing_deg': wire_packet['bearing_deg'] / 100.0 if wire_packet.get('bearing_deg') else None,
                 'gcc_phat': wire_packet.get('gcc_phat_metadata') is not None,
                 'error': error_msg
-            }, status=202 if forwarded else 500)
+            }), content_type='application/json', status=202 if forwarded else 500)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON payload: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid JSON payload: %s", e)
             return JsonResponse({
                 'status': 'error',
                 'error': 'Invalid JSON payload'
             }, status=400)
         except Exception as e:
-            logger.error(f"Error processing webhook: {e}", exc_info=True)
+            # Tracebacks only when debugging; formatting them is costly on an error burst
+            logger.error("Error processing webhook: %s", e,
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
             return JsonResponse({
                 'status': 'error',
                 'error': str(e)
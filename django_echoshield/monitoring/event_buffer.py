@@ -0,0 +1,236 @@
+"""
+Redis-backed ingest buffer for Canonical Events.
+
+The ingest API appends each Canonical Event to a Redis list instead of
+inserting it directly; the flush_event_buffer Celery task drains the list
+in large batches with bulk_create.
+
+Popped events are moved to a processing list and only dropped once the batch
+has been committed, so a worker killed mid-flush loses nothing. Events that
+keep failing are parked on a dead-letter list.
+"""
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import orjson
+import redis
+from redis.lock import Lock
+from django.conf import settings
+
+
+# Global Redis client instance
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Get the global Redis client used for the event buffer (singleton pattern).
+
+    Returns:
+        Redis client instance
+    """
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.ECHOSHIELD['EVENT_BUFFER_REDIS_URL'])
+    return _client
+
+
+# Moves up to ARGV[1] events from the buffer head to the processing list in one
+# step; RPUSH is chunked to stay under Lua's unpack() limit
+POP_EVENTS_SCRIPT = """
+local events = redis.call('LRANGE', KEYS[1], 0, ARGV[1] - 1)
+if #events > 0 then
+    redis.call('LTRIM', KEYS[1], #events, -1)
+    for i = 1, #events, 1000 do
+        redis.call('RPUSH', KEYS[2], unpack(events, i, math.min(i + 999, #events)))
+    end
+end
+return events
+"""
+
+
+def _buffer_key() -> str:
+    return settings.ECHOSHIELD.get('EVENT_BUFFER_KEY', 'echoshield:event_buffer')
+
+
+def _processing_key() -> str:
+    return _buffer_key() + ':processing'
+
+
+def _dead_letter_key() -> str:
+    return _buffer_key() + ':dead'
+
+
+def flush_lock() -> Lock:
+    """
+    Get the lock that allows a single worker at a time to drain the buffer.
+
+    Returns:
+        Redis lock; it expires after EVENT_BUFFER_LOCK_TIMEOUT_S so a killed
+        worker doesn't block flushing for good
+    """
+    return get_redis().lock(
+        _buffer_key() + ':lock',
+        timeout=settings.ECHOSHIELD.get('EVENT_BUFFER_LOCK_TIMEOUT_S', 300)
+    )
+
+
+def post_flush_lock() -> Lock:
+    """
+    Get the lock that keeps deduplication/aggregation runs from overlapping.
+
+    Returns:
+        Redis lock with the same expiry as flush_lock
+    """
+    return get_redis().lock(
+        _buffer_key() + ':post_flush:lock',
+        timeout=settings.ECHOSHIELD.get('EVENT_BUFFER_LOCK_TIMEOUT_S', 300)
+    )
+
+
+def mark_post_flush_pending() -> bool:
+    """
+    Record that flushed events await deduplication and aggregation.
+
+    Returns:
+        True if no run was pending yet, i.e. the caller should queue one
+    """
+    return bool(get_redis().set(
+        _buffer_key() + ':post_flush:pending', 1, nx=True,
+        ex=settings.ECHOSHIELD.get('EVENT_BUFFER_LOCK_TIMEOUT_S', 300)
+    ))
+
+
+def clear_post_flush_pending() -> None:
+    """Allow the next flush to queue another run; called when a run starts."""
+    get_redis().delete(_buffer_key() + ':post_flush:pending')
+
+
+def add_post_flush_scope(first_ts_by_node: Dict[str, int], buckets: Iterable[int]) -> None:
+    """
+    Record what the next deduplication/aggregation run has to look at.
+
+    Args:
+        first_ts_by_node: Sensor node ID -> earliest ts_ns of its flushed events
+        buckets: Aggregation buckets (ts_ns // AGGREGATION_WINDOW_NS) of the
+            flushed events
+    """
+    client = get_redis()
+    nodes_key = _buffer_key() + ':post_flush:nodes'
+    buckets = list(buckets)
+    if not first_ts_by_node and not buckets:
+        return
+
+    # Keep the earliest timestamp per node; a run taking the scope in between
+    # only leaves it a little wider than needed
+    merged = dict(first_ts_by_node)
+    if merged:
+        for node_id, stored_ts in zip(merged, client.hmget(nodes_key, list(merged))):
+            if stored_ts is not None:
+                merged[node_id] = min(merged[node_id], int(stored_ts))
+
+    pipe = client.pipeline(transaction=True)
+    if merged:
+        pipe.hset(nodes_key, mapping=merged)
+    if buckets:
+        pipe.sadd(_buffer_key() + ':post_flush:buckets', *buckets)
+    pipe.execute()
+
+
+def take_post_flush_scope() -> Tuple[Dict[str, int], List[int]]:
+    """
+    Remove and return the scope recorded by add_post_flush_scope.
+
+    Returns:
+        Tuple of (first_ts_by_node, sorted buckets)
+    """
+    nodes_key = _buffer_key() + ':post_flush:nodes'
+    buckets_key = _buffer_key() + ':post_flush:buckets'
+    pipe = get_redis().pipeline(transaction=True)
+    pipe.hgetall(nodes_key)
+    pipe.smembers(buckets_key)
+    pipe.delete(nodes_key, buckets_key)
+    raw_nodes, raw_buckets, _ = pipe.execute()
+    return (
+        {node_id.decode(): int(ts) for node_id, ts in raw_nodes.items()},
+        sorted(int(bucket) for bucket in raw_buckets)
+    )
+
+
+def push_event(canonical: Dict[str, Any]) -> None:
+    """
+    Append a Canonical Event to the ingest buffer.
+
+    Args:
+        canonical: Canonical Event dictionary (see wire_codec.to_canonical)
+    """
+    get_redis().rpush(_buffer_key(), orjson.dumps(canonical))
+
+
+def pop_events(max_events: int) -> List[Dict[str, Any]]:
+    """
+    Move up to max_events Canonical Events from the buffer head to the
+    processing list.
+
+    The caller must hold flush_lock and finish the batch with ack_events or
+    requeue_events.
+
+    Args:
+        max_events: Maximum number of events to remove
+
+    Returns:
+        List of Canonical Event dictionaries, oldest first
+    """
+    pop_script = get_redis().register_script(POP_EVENTS_SCRIPT)
+    raw_events = pop_script(keys=[_buffer_key(), _processing_key()], args=[max_events])
+    return [orjson.loads(raw) for raw in raw_events]
+
+
+def ack_events() -> None:
+    """Drop the processing list once its batch has been committed."""
+    get_redis().delete(_processing_key())
+
+
+def recover_events() -> int:
+    """
+    Put events left on the processing list by a killed worker back at the
+    buffer head.
+
+    Returns:
+        Number of events recovered
+    """
+    client = get_redis()
+    raw_events = client.lrange(_processing_key(), 0, -1)
+    if raw_events:
+        pipe = client.pipeline(transaction=True)
+        pipe.lpush(_buffer_key(), *reversed(raw_events))
+        pipe.delete(_processing_key())
+        pipe.execute()
+    return len(raw_events)
+
+
+def requeue_events(events: List[Dict[str, Any]], attempts: int) -> None:
+    """
+    Put events back at the buffer head, preserving their order, and drop the
+    processing list.
+
+    Args:
+        events: Canonical Event dictionaries previously returned by pop_events
+        attempts: Failed flush attempts so far, stored as 'flush_attempts'
+    """
+    pipe = get_redis().pipeline(transaction=True)
+    if events:
+        pipe.lpush(_buffer_key(), *(
+            orjson.dumps(dict(e, flush_attempts=attempts)) for e in reversed(events)
+        ))
+    pipe.delete(_processing_key())
+    pipe.execute()
+
+
+def dead_letter_events(events: List[Dict[str, Any]]) -> None:
+    """
+    Park events that can't be written on the dead-letter list for inspection.
+
+    Args:
+        events: Canonical Event dictionaries
+    """
+    if events:
+        get_redis().rpush(_dead_letter_key(), *(orjson.dumps(e) for e in events))
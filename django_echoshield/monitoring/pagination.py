@@ -0,0 +1,19 @@
+"""
+Cursor pagination classes for monitoring API endpoints.
+
+Cursor pages seek directly to their position via an indexed ORDER BY column,
+so deep pages cost the same as the first one (no OFFSET scan).
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class EventCursorPagination(CursorPagination):
+    """Paginate events newest-first on receipt time (idx_event_rx_desc)."""
+    ordering = '-rx_ns'
+    page_size = 100
+
+
+class TrackCursorPagination(CursorPagination):
+    """Paginate tracks most-recently-updated first (last_ts_ns index)."""
+    ordering = '-last_ts_ns'
+    page_size = 100
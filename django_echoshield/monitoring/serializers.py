@@ -3,9 +3,15 @@ Django REST Framework serializers for monitoring app.
 
 Handles WirePacket and Canonical Event serialization/deserialization.
 """
+import uuid
 from rest_framework import serializers
 from core.models import Event, Track, TrackContributor
 
+# Column limits; buffered packets are only written later, so values the
+# database would reject must fail validation at ingest
+INT32_MAX = 2**31 - 1
+INT64_MAX = 2**63 - 1
+
 
 class LocationIntSerializer(serializers.Serializer):
     """
@@ -35,8 +41,8 @@ class GccPhatMetadataSerializer(serializers.Serializer):
     """
     Serializer for GCC-PHAT bearing estimation metadata.
     """
-    method = serializers.CharField(default='GCC_PHAT_TDOA')
-    paired_node_id = serializers.CharField()
+    method = serializers.CharField(max_length=50, default='GCC_PHAT_TDOA')
+    paired_node_id = serializers.CharField(max_length=255)
     baseline_distance_m = serializers.FloatField()
     tdoa_sec = serializers.FloatField()
     baseline_bearing_deg = serializers.FloatField()
@@ -53,7 +59,8 @@ class WirePacketSerializer(serializers.Serializer):
     sensor_type = serializers.ChoiceField(
         choices=['acoustic', 'vision', 'hybrid']
     )
-    ts_ns = serializers.IntegerField(help_text="Detection timestamp (nanoseconds)")
+    ts_ns = serializers.IntegerField(min_value=0, max_value=INT64_MAX,
+                                     help_text="Detection timestamp (nanoseconds)")
     sensor_node_id = serializers.CharField(max_length=255)
     location = LocationIntSerializer()
     bearing_deg = serializers.IntegerField(
@@ -64,15 +71,23 @@ class WirePacketSerializer(serializers.Serializer):
         min_value=0, max_value=100,
         help_text="Confidence * 100 (0-100)"
     )
-    n_objects_detected = serializers.IntegerField(min_value=0)
-    event_code = serializers.IntegerField()
+    n_objects_detected = serializers.IntegerField(min_value=0, max_value=INT32_MAX)
+    event_code = serializers.IntegerField(min_value=-INT32_MAX, max_value=INT32_MAX)
     location_method = serializers.ChoiceField(
         required=False, allow_null=True,
         choices=['LOC_BEARING_ONLY', 'LOC_ACOUSTIC_TRIANGULATION']
     )
-    packet_version = serializers.IntegerField(required=False, allow_null=True, default=1)
+    packet_version = serializers.IntegerField(required=False, allow_null=True, default=1,
+                                              min_value=-INT32_MAX - 1, max_value=INT32_MAX)
     gcc_phat_metadata = GccPhatMetadataSerializer(required=False, allow_null=True)
 
+    def validate_event_id(self, value):
+        """Event IDs are stored as UUIDs; keep the string form for raw_wire_json."""
+        try:
+            return str(uuid.UUID(value))
+        except ValueError:
+            raise serializers.ValidationError("event_id must be a valid UUID")
+
 
 class CanonicalEventSerializer(serializers.Serializer):
     """
@@ -117,18 +132,50 @@ class EventSerializer(serializers.ModelSerializer):
     """
     latency_ms = serializers.FloatField(read_only=True)
     timestamp_datetime = serializers.DateTimeField(read_only=True)
+    sensor_node_id = serializers.CharField(source='sensor_node.name', read_only=True,
+                                           allow_null=True)
+    event_code = serializers.CharField(source='event_code.name', read_only=True,
+                                       allow_null=True)
+    object_track_id = serializers.IntegerField(read_only=True, allow_null=True)
+    gcc_phat_metadata = GccPhatMetadataSerializer(source='gcc_phat', read_only=True)
 
     class Meta:
         model = Event
-        fields = '__all__'
+        exclude = ['sensor_node', 'object_track']
         read_only_fields = [
             'id', 'event_id', 'created_at', 'updated_at',
             'latency_ms', 'timestamp_datetime'
         ]
 
 
+class EventListSerializer(serializers.Serializer):
+    """
+    Lightweight Event serializer for list endpoints.
+
+    Reads the dictionaries produced by ``QuerySet.values()`` (see
+    ``EVENT_LIST_FIELDS``) instead of model instances.
+    """
+    event_id = serializers.UUIDField()
+    sensor_type = serializers.CharField()
+    sensor_node_id = serializers.CharField(source='sensor_node_name', allow_null=True)
+    ts_ns = serializers.IntegerField()
+    rx_ns = serializers.IntegerField()
+    latency_ns = serializers.IntegerField()
+    latency_ms = serializers.FloatField()
+    latency_status = serializers.CharField()
+    lat = serializers.FloatField(allow_null=True)
+    lon = serializers.FloatField(allow_null=True)
+    bearing_deg = serializers.FloatField(allow_null=True)
+    bearing_conf = serializers.FloatField(allow_null=True)
+    validity_status = serializers.CharField()
+    duplicate_flag = serializers.BooleanField()
+    object_track_id = serializers.IntegerField(allow_null=True)
+    created_at = serializers.DateTimeField()
+
+
 class TrackContributorSerializer(serializers.ModelSerializer):
     """Serializer for track contributors."""
+    sensor_node_id = serializers.CharField(source='sensor_node.name', read_only=True)
 
     class Meta:
         model = TrackContributor
@@ -146,7 +193,7 @@ class TrackSerializer(serializers.ModelSerializer):
     class Meta:
         model = Track
         fields = '__all__'
-        read_only_fields = ['track_id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'track_uuid', 'created_at', 'updated_at']
 
     def get_contributor_count(self, obj):
         """Get the number of contributors to this track."""
@@ -2,23 +2,34 @@
 Celery tasks for background processing.
 
 Implements:
+- Ingest buffer flushing (batched Event inserts)
 - Track aggregation (multi-node clustering)
 - Event deduplication
 - Expired track cleanup
 """
 import logging
 import math
-from typing import List, Dict, Any
+import uuid
+from typing import List, Dict, Any, Optional
 from collections import defaultdict
 from django.conf import settings
-from django.db import transaction
+from django.db import InterfaceError, OperationalError, transaction
+from django.db.models import Q
 from django.utils import timezone
 from celery import shared_task
 
-from core.models import Event, Track, TrackContributor
+from core.models import EventCode, Event, GccPhatMetadata, SensorNode, Track, TrackContributor
+from .event_buffer import (
+    ack_events, add_post_flush_scope, clear_post_flush_pending, dead_letter_events,
+    flush_lock, mark_post_flush_pending, pop_events, post_flush_lock, recover_events,
+    requeue_events, take_post_flush_scope
+)
 
 logger = logging.getLogger(__name__)
 
+# Namespace for deriving stable track UUIDs from aggregation buckets
+TRACK_UUID_NAMESPACE = uuid.UUID('7a9db0e7-1cad-4b08-83a8-5faf15591f11')
+
 
 def angular_diff(angle1: float, angle2: float) -> float:
     """
@@ -35,8 +46,188 @@ def angular_diff(angle1: float, angle2: float) -> float:
     return min(diff, 360.0 - diff)
 
 
+def write_events(canonical_events: List[Dict[str, Any]], batch_size: int):
+    """
+    Insert Canonical Events and their GCC-PHAT metadata in one transaction.
+
+    Event IDs that already exist are skipped.
+
+    Args:
+        canonical_events: Canonical Event dictionaries (see wire_codec.to_canonical)
+        batch_size: Maximum rows per INSERT statement
+    """
+    with transaction.atomic():
+        # Node and event code strings are stored as lookup table keys
+        node_ids = SensorNode.resolve_ids(c['sensor_node_id'] for c in canonical_events)
+        code_ids = EventCode.resolve_ids(c.get('event_code') for c in canonical_events)
+
+        gcc_phat_by_event_id = {}
+        events = []
+        for canonical in canonical_events:
+            row = dict(canonical)
+            row['sensor_node_id'] = node_ids.get(row['sensor_node_id'])
+            row['event_code_id'] = code_ids.get(row.pop('event_code', None))
+            gcc_phat_metadata = row.pop('gcc_phat_metadata', None)
+            if gcc_phat_metadata:
+                gcc_phat_by_event_id[row['event_id']] = gcc_phat_metadata
+            events.append(Event(**row))
+
+        Event.objects.bulk_create(events, batch_size=batch_size, ignore_conflicts=True)
+
+        if gcc_phat_by_event_id:
+            # ignore_conflicts doesn't return primary keys, so look them up
+            event_pks = Event.objects.filter(
+                event_id__in=list(gcc_phat_by_event_id)
+            ).values_list('event_id', 'id')
+            GccPhatMetadata.objects.bulk_create(
+                [
+                    GccPhatMetadata(event_id=pk, **gcc_phat_by_event_id[str(event_id)])
+                    for event_id, pk in event_pks
+                ],
+                batch_size=batch_size,
+                ignore_conflicts=True
+            )
+
+
+def write_events_individually(canonical_events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Insert Canonical Events one at a time, collecting the ones that fail.
+
+    Used for batches that failed repeatedly, so one bad row can't hold back
+    the rest of the buffer. Connection errors are raised, not collected.
+
+    Args:
+        canonical_events: Canonical Event dictionaries
+
+    Returns:
+        Events that could not be written
+    """
+    failed = []
+    for canonical in canonical_events:
+        try:
+            write_events([canonical], batch_size=1)
+        except (OperationalError, InterfaceError):
+            raise
+        except Exception as e:
+            logger.error("Failed to write event %s: %s", canonical.get('event_id'), e)
+            failed.append(canonical)
+    return failed
+
+
 @shared_task
-def deduplicate_events():
+def flush_event_buffer():
+    """
+    Drain buffered Canonical Events from Redis into the database.
+
+    Events are inserted with one multi-row INSERT per batch; event IDs that
+    already exist are skipped. On failure the batch is put back on the buffer;
+    after EVENT_BUFFER_MAX_ATTEMPTS failures it is written row by row and the
+    failing rows are dead-lettered. Database connection errors, and batches in
+    which every row fails, don't count as attempts, so an outage never sends
+    events to the dead-letter list. Only one worker flushes at a time.
+    When new events were written, process_flushed_events is queued, so
+    deduplication and aggregation don't poll the database while ingest is idle.
+    """
+    batch_size = settings.ECHOSHIELD.get('EVENT_BUFFER_BATCH_SIZE', 10_000)
+    max_attempts = settings.ECHOSHIELD.get('EVENT_BUFFER_MAX_ATTEMPTS', 3)
+    window_ns = settings.ECHOSHIELD.get('AGGREGATION_WINDOW_NS', 10_000_000_000)
+    flushed = 0
+
+    # What process_flushed_events needs to revisit
+    first_ts_by_node: Dict[str, int] = {}
+    buckets = set()
+
+    lock = flush_lock()
+    if not lock.acquire(blocking=False):
+        logger.debug("Event buffer flush already running")
+        return 0
+
+    try:
+        recovered = recover_events()
+        if recovered:
+            logger.warning("Recovered %d events from an interrupted flush", recovered)
+
+        while True:
+            canonical_events = pop_events(batch_size)
+            if not canonical_events:
+                break
+
+            attempts = max(c.pop('flush_attempts', 0) for c in canonical_events)
+            try:
+                if attempts >= max_attempts:
+                    failed = write_events_individually(canonical_events)
+                    if len(failed) == len(canonical_events):
+                        # Not one row could be written: blame the database, not the rows
+                        logger.warning("All %d events of a retried batch failed; requeued",
+                                       len(failed))
+                        requeue_events(canonical_events, attempts)
+                        break
+                    dead_letter_events(failed)
+                    written = len(canonical_events) - len(failed)
+                else:
+                    write_events(canonical_events, batch_size)
+                    written = len(canonical_events)
+            except (OperationalError, InterfaceError):
+                # Database unavailable; doesn't count against the batch
+                requeue_events(canonical_events, attempts)
+                raise
+            except Exception:
+                requeue_events(canonical_events, attempts + 1)
+                raise
+            ack_events()
+
+            for canonical in canonical_events:
+                node_id, ts_ns = canonical['sensor_node_id'], canonical['ts_ns']
+                first_ts_by_node[node_id] = min(ts_ns, first_ts_by_node.get(node_id, ts_ns))
+                buckets.add(ts_ns // window_ns)
+
+            flushed += written
+            if len(canonical_events) < batch_size:
+                break
+            lock.reacquire()
+    finally:
+        lock.release()
+
+    if flushed:
+        logger.info("Event buffer flush complete: %d events written", flushed)
+        add_post_flush_scope(first_ts_by_node, buckets)
+        # At most one run waits in the queue; it picks up every flush before it starts
+        if mark_post_flush_pending():
+            process_flushed_events.delay()
+    return flushed
+
+
+@shared_task(bind=True, max_retries=None)
+def process_flushed_events(self):
+    """
+    Deduplicate and aggregate newly flushed events, one run at a time.
+
+    Only the nodes and aggregation buckets of events flushed since the last
+    run are examined. If a previous run is still in progress, retry once it is
+    likely done rather than scanning the same events concurrently.
+    """
+    lock = post_flush_lock()
+    if not lock.acquire(blocking=False):
+        raise self.retry(countdown=2)
+
+    try:
+        # Flushes from here on queue a follow-up run
+        clear_post_flush_pending()
+        first_ts_by_node, buckets = take_post_flush_scope()
+        try:
+            # Deduplicate first so aggregation skips events about to be flagged
+            deduplicate_events(first_ts_by_node)
+            aggregate_tracks(buckets)
+        except Exception:
+            # Leave the scope for the run queued by the next flush
+            add_post_flush_scope(first_ts_by_node, buckets)
+            raise
+    finally:
+        lock.release()
+
+
+@shared_task
+def deduplicate_events(first_ts_by_node: Optional[Dict[str, int]] = None):
     """
     Mark duplicate events from the same node.
 
@@ -44,6 +235,11 @@ def deduplicate_events():
     - Same sensor_node_id
     - Time delta <= 5 seconds
     - Bearing difference <= 20 degrees (circular)
+
+    Args:
+        first_ts_by_node: Optional sensor node ID -> earliest ts_ns of newly
+            flushed events; only those nodes' events from one time delta
+            before it are checked. All recent events are checked if omitted.
     """
     logger.info("Starting event deduplication task")
 
@@ -53,19 +249,31 @@ def deduplicate_events():
 
     # Load recent events (last 10 minutes, not already marked as duplicates)
     ten_minutes_ago = timezone.now() - timezone.timedelta(minutes=10)
-    events = list(Event.objects.filter(
+    events = Event.objects.filter(
         created_at__gte=ten_minutes_ago,
         duplicate_flag=False
-    ).order_by('sensor_node_id', 'ts_ns'))
+    )
+    if first_ts_by_node is not None:
+        if not first_ts_by_node:
+            logger.info("Deduplication complete: no new events")
+            return 0
+        node_scope = Q()
+        for node_id, first_ts in first_ts_by_node.items():
+            node_scope |= Q(sensor_node__name=node_id, ts_ns__gte=first_ts - time_delta_ns)
+        events = events.filter(node_scope)
+    events = list(
+        events.only('id', 'event_id', 'sensor_node', 'ts_ns', 'bearing_deg')
+        .order_by('sensor_node_id', 'ts_ns')
+    )
 
     duplicates = []
 
     # Check for duplicates
     for i, event_a in enumerate(events):
         for event_b in events[i+1:]:
-            # Same node?
+            # Same node? Events are sorted by node, so the rest are other nodes
             if event_a.sensor_node_id != event_b.sensor_node_id:
-                continue
+                break
 
             # Within time window?
             time_diff = abs(event_a.ts_ns - event_b.ts_ns)
@@ -81,7 +289,7 @@ def deduplicate_events():
             # Mark newer event as duplicate
             newer = event_a if event_a.ts_ns >= event_b.ts_ns else event_b
             duplicates.append(newer.id)
-            logger.info(f"Marked event {newer.event_id} as duplicate")
+            logger.info("Marked event %s as duplicate", newer.event_id)
 
     # Update duplicates in database
     if duplicates:
@@ -89,7 +297,7 @@ def deduplicate_events():
             duplicate_flag=True,
             validity_status='invalid'
         )
-        logger.info(f"Deduplication complete: {len(duplicates)} duplicates marked")
+        logger.info("Deduplication complete: %d duplicates marked", len(duplicates))
     else:
         logger.info("Deduplication complete: no duplicates found")
 
@@ -97,7 +305,7 @@ def deduplicate_events():
 
 
 @shared_task
-def aggregate_tracks():
+def aggregate_tracks(buckets: Optional[List[int]] = None):
     """
     Aggregate bearing-only detections from multiple nodes into tracks.
 
@@ -105,6 +313,13 @@ def aggregate_tracks():
     - Time window: 10 seconds
     - Minimum contributors: 2 distinct nodes
     - Averaging strategy: circular mean for bearings
+
+    Buckets that received new events are recomputed from all of their events,
+    including those already linked to the bucket's track.
+
+    Args:
+        buckets: Optional bucket keys (ts_ns // window) to consider; all recent
+            events are considered if omitted
     """
     logger.info("Starting track aggregation task")
 
@@ -118,23 +333,52 @@ def aggregate_tracks():
         created_at__gte=recent_cutoff,
         duplicate_flag=False,
         bearing_deg__isnull=False,
-        object_track_id__isnull=True  # Not yet assigned to a track
-    ).order_by('ts_ns')
+        object_track__isnull=True  # Not yet assigned to a track
+    )
+    if buckets is not None:
+        bucket_scope = Q()
+        for bucket_key in buckets:
+            bucket_scope |= Q(ts_ns__gte=bucket_key * window_ns,
+                              ts_ns__lt=(bucket_key + 1) * window_ns)
+        bearing_events = bearing_events.filter(bucket_scope) if buckets else Event.objects.none()
+    bearing_events = bearing_events.defer('raw_wire_json').order_by('ts_ns')
 
     if not bearing_events:
         logger.info("No events to aggregate")
         return 0
 
-    # Cluster events by time buckets
-    buckets = defaultdict(list)
+    # Cluster new events by time buckets
+    new_by_bucket = defaultdict(list)
     for event in bearing_events:
         bucket_key = event.ts_ns // window_ns
-        buckets[bucket_key].append(event)
+        new_by_bucket[bucket_key].append(event)
+
+    # Tracks already created for those buckets, and the events linked to them
+    bucket_uuids = {
+        bucket_key: uuid.uuid5(TRACK_UUID_NAMESPACE, f"bearing-{bucket_key}")
+        for bucket_key in new_by_bucket
+    }
+    existing_tracks = {
+        track.track_uuid: track
+        for track in Track.objects.filter(track_uuid__in=list(bucket_uuids.values()))
+    }
+    linked_by_track = defaultdict(list)
+    for event in Event.objects.filter(
+        object_track__in=list(existing_tracks.values()),
+        duplicate_flag=False,
+        bearing_deg__isnull=False
+    ).defer('raw_wire_json'):
+        linked_by_track[event.object_track_id].append(event)
 
     tracks_created = 0
 
     # Process each bucket
-    for bucket_key, events in buckets.items():
+    for bucket_key, new_events in new_by_bucket.items():
+        track_uuid = bucket_uuids[bucket_key]
+        existing_track = existing_tracks.get(track_uuid)
+        linked_events = linked_by_track[existing_track.id] if existing_track else []
+        events = linked_events + new_events
+
         # Check if we have enough distinct nodes
         distinct_nodes = {e.sensor_node_id for e in events}
         if len(distinct_nodes) < min_contributors:
@@ -157,13 +401,12 @@ def aggregate_tracks():
         confidence = max(0.0, 1.0 - (bearing_std / 180.0))
 
         # Create or update track
-        track_id = f"bearing-{bucket_key}"
         first_ts = min(e.ts_ns for e in events)
         last_ts = max(e.ts_ns for e in events)
 
         with transaction.atomic():
             track, created = Track.objects.update_or_create(
-                track_id=track_id,
+                track_uuid=track_uuid,
                 defaults={
                     'method': 'bearing_only',
                     'first_ts_ns': first_ts,
@@ -174,27 +417,33 @@ def aggregate_tracks():
                 }
             )
 
-            # Link events to track
-            for event in events:
-                event.object_track_id = track_id
-                event.save(update_fields=['object_track_id'])
-
-                # Create contributor record
-                TrackContributor.objects.get_or_create(
-                    track=track,
-                    event=event,
-                    defaults={
-                        'sensor_node_id': event.sensor_node_id,
-                        'bearing_deg': event.bearing_deg,
-                        'ts_ns': event.ts_ns
-                    }
+            if not created:
+                # Drop links to events flagged as duplicates since the last run
+                TrackContributor.objects.filter(track=track, event__duplicate_flag=True).delete()
+                Event.objects.filter(object_track=track, duplicate_flag=True).update(
+                    object_track=None
                 )
 
+            # Link new events to track in a single UPDATE
+            Event.objects.filter(id__in=[e.id for e in new_events]).update(object_track=track)
+
+            # Create contributor records in one upsert
+            TrackContributor.bulk_upsert(
+                {
+                    'track': track,
+                    'event': event,
+                    'sensor_node_id': event.sensor_node_id,
+                    'bearing_deg': event.bearing_deg,
+                    'ts_ns': event.ts_ns
+                }
+                for event in new_events
+            )
+
             if created:
                 tracks_created += 1
-                logger.info(f"Created track {track_id} with {len(events)} contributors")
+                logger.info("Created track %s with %d contributors", track_uuid, len(events))
 
-    logger.info(f"Track aggregation complete: {tracks_created} tracks created")
+    logger.info("Track aggregation complete: %d tracks created", tracks_created)
     return tracks_created
 
 
@@ -218,7 +467,7 @@ def cleanup_expired_tracks():
         last_ts_ns__lt=cutoff_ns
     ).update(status='expired')
 
-    logger.info(f"Expired track cleanup complete: {expired} tracks marked as expired")
+    logger.info("Expired track cleanup complete: %d tracks marked as expired", expired)
     return expired
 
 
@@ -25,4 +25,5 @@ urlpatterns = [
     # Dashboard views
     path('dashboard/', views.dashboard_view, name='dashboard'),
     path('dashboard/events/', views.events_api, name='events_api'),
+    path('dashboard/nodes/', views.node_stats_api, name='node_stats_api'),
 ]
@@ -8,27 +8,58 @@ Handles:
 """
 import logging
 from django.conf import settings
+from django.db import connection
 from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.views import View
 from django.utils.decorators import method_decorator
-from django.db.models import Count, Avg, Max, Min, Q
+from django.db.models import (
+    Count, Avg, Max, Min, Q, F, Value, FloatField, Prefetch
+)
+from django.db.models.functions import Cast
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-import json
+import orjson
 
-from core.models import Event, Track, TrackContributor
+from core.models import Event, SensorNode, Track, TrackContributor
 from .serializers import (
-    WirePacketSerializer, EventSerializer, TrackSerializer,
+    WirePacketSerializer, EventSerializer, EventListSerializer, TrackSerializer,
     CanonicalEventSerializer
 )
+from .pagination import EventCursorPagination, TrackCursorPagination
 from .wire_codec import to_canonical, get_current_time_ns
+from .event_buffer import push_event
 
 logger = logging.getLogger(__name__)
 
+# Columns fetched by list endpoints; the JSON audit blob is left to detail views
+EVENT_LIST_FIELDS = (
+    'event_id', 'sensor_type', 'ts_ns', 'rx_ns', 'latency_ns',
+    'latency_status', 'lat', 'lon', 'bearing_deg', 'bearing_conf', 'validity_status',
+    'duplicate_flag', 'object_track_id', 'created_at'
+)
+
+
+def event_list_values(queryset):
+    """
+    Fetch list columns as dictionaries instead of Event instances.
+
+    Args:
+        queryset: Event queryset to read from
+
+    Returns:
+        ValuesQuerySet with EVENT_LIST_FIELDS plus sensor_node_name and a
+        computed latency_ms
+    """
+    return queryset.values(*EVENT_LIST_FIELDS, sensor_node_name=F('sensor_node__name')).annotate(
+        # bigint / decimal literal is numeric on PostgreSQL; cast so the
+        # driver returns a float rather than a Decimal
+        latency_ms=Cast(F('latency_ns') / Value(1_000_000.0), FloatField())
+    )
+
 
 @require_http_methods(["GET"])
 def health_check(request):
@@ -48,21 +79,23 @@ class IngestWireView(View):
     POST /api/v0/ingest/wire
     Content-Type: application/json
 
-    Accepts WirePacket format and converts to Canonical Event.
+    Accepts WirePacket format and converts to Canonical Event. Events are
+    queued in the Redis ingest buffer and written in batches by the
+    flush_event_buffer task.
     """
 
     def post(self, request):
         """Handle POST request with WirePacket payload."""
         try:
             # Parse JSON payload
-            wire_packet = json.loads(request.body)
-            logger.info(f"Received WirePacket: event_id={wire_packet.get('event_id')}, "
-                       f"node={wire_packet.get('sensor_node_id')}")
+            wire_packet = orjson.loads(request.body)
+            logger.info("Received WirePacket: event_id=%s, node=%s",
+                        wire_packet.get('event_id'), wire_packet.get('sensor_node_id'))
 
             # Validate with serializer
             serializer = WirePacketSerializer(data=wire_packet)
             if not serializer.is_valid():
-                logger.error(f"Invalid WirePacket: {serializer.errors}")
+                logger.error("Invalid WirePacket: %s", serializer.errors)
                 return JsonResponse({
                     'status': 'error',
                     'errors': serializer.errors
@@ -74,52 +107,34 @@ class IngestWireView(View):
             # Convert to Canonical Event
             canonical = to_canonical(serializer.validated_data, rx_ns)
 
-            # Create Event model instance
-            event = Event.objects.create(
-                event_id=canonical['event_id'],
-                sensor_type=canonical['sensor_type'],
-                sensor_node_id=canonical['sensor_node_id'],
-                ts_ns=canonical['ts_ns'],
-                rx_ns=canonical['rx_ns'],
-                latency_ns=canonical['latency_ns'],
-                latency_status=canonical['latency_status'],
-                lat=canonical.get('lat'),
-                lon=canonical.get('lon'),
-                error_radius_m=canonical.get('error_radius_m'),
-                bearing_deg=canonical.get('bearing_deg'),
-                bearing_conf=canonical.get('bearing_conf'),
-                n_objects=canonical.get('n_objects'),
-                event_code=canonical.get('event_code'),
-                location_method=canonical.get('location_method'),
-                packet_version=canonical.get('packet_version'),
-                validity_status=canonical['validity_status'],
-                duplicate_flag=canonical['duplicate_flag'],
-                gcc_phat_metadata=canonical.get('gcc_phat_metadata'),
-                raw_wire_json=canonical['raw_wire_json']
-            )
-
-            logger.info(f"Event created: {event.event_id}, latency={event.latency_ms:.2f}ms, "
-                       f"status={event.latency_status}")
+            # Buffer for batched insertion by flush_event_buffer
+            push_event(canonical)
+
+            latency_ms = canonical['latency_ns'] / 1_000_000
+            logger.info("Event buffered: %s, latency=%.2fms, status=%s",
+                        canonical['event_id'], latency_ms, canonical['latency_status'])
 
             # Return response
             return JsonResponse({
                 'status': 'accepted',
-                'event_id': event.event_id,
-                'location_method': event.location_method,
-                'bearing_deg': event.bearing_deg,
-                'latency_ms': event.latency_ms,
-                'latency_status': event.latency_status,
-                'gcc_phat': event.gcc_phat_metadata is not None
+                'event_id': canonical['event_id'],
+                'location_method': canonical['location_method'],
+                'bearing_deg': canonical['bearing_deg'],
+                'latency_ms': latency_ms,
+                'latency_status': canonical['latency_status'],
+                'gcc_phat': bool(canonical.get('gcc_phat_metadata'))
             }, status=202)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON payload: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid JSON payload: %s", e)
             return JsonResponse({
                 'status': 'error',
                 'error': 'Invalid JSON payload'
             }, status=400)
         except Exception as e:
-            logger.error(f"Error processing ingest: {e}", exc_info=True)
+            # Tracebacks only when debugging; formatting them is costly on an error burst
+            logger.error("Error processing ingest: %s", e,
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
             return JsonResponse({
                 'status': 'error',
                 'error': str(e)
@@ -132,14 +147,26 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
 
     Provides list and retrieve endpoints for events.
     """
-    queryset = Event.objects.all()
+    queryset = Event.objects.select_related('gcc_phat', 'sensor_node', 'event_code')
     serializer_class = EventSerializer
+    pagination_class = EventCursorPagination
     ordering = ['-rx_ns']
     filterset_fields = [
-        'sensor_type', 'sensor_node_id', 'latency_status',
+        'sensor_type', 'sensor_node__name', 'latency_status',
         'validity_status', 'duplicate_flag', 'location_method'
     ]
-    search_fields = ['event_id', 'sensor_node_id', 'object_track_id']
+    search_fields = ['event_id', 'sensor_node__name', 'object_track__track_uuid']
+
+    def get_queryset(self):
+        """List responses read plain dictionaries; detail keeps full instances."""
+        if self.action == 'list':
+            return event_list_values(Event.objects.order_by('-rx_ns'))
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EventListSerializer
+        return super().get_serializer_class()
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
@@ -152,8 +179,17 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
             - latency_percentiles (p50, p95, p99)
             - events_by_status
         """
-        # Total events
-        total_events = Event.objects.count()
+        # All per-status counts in a single scan
+        counts = Event.objects.aggregate(
+            total=Count('id'),
+            normal=Count('id', filter=Q(latency_status='normal')),
+            delayed=Count('id', filter=Q(latency_status='delayed')),
+            obsolete=Count('id', filter=Q(latency_status='obsolete')),
+            valid=Count('id', filter=Q(validity_status='valid')),
+            invalid=Count('id', filter=Q(validity_status='invalid')),
+            unknown=Count('id', filter=Q(validity_status='unknown')),
+            duplicates=Count('id', filter=Q(duplicate_flag=True)),
+        )
 
         # Active nodes (nodes with events in last 5 minutes)
         five_minutes_ago_ns = get_current_time_ns() - (5 * 60 * 1_000_000_000)
@@ -161,29 +197,20 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
             rx_ns__gte=five_minutes_ago_ns
         ).values('sensor_node_id').distinct().count()
 
-        # Events by status
-        events_by_status = {
-            'normal': Event.objects.filter(latency_status='normal').count(),
-            'delayed': Event.objects.filter(latency_status='delayed').count(),
-            'obsolete': Event.objects.filter(latency_status='obsolete').count(),
-        }
-
-        # Validity status
-        events_by_validity = {
-            'valid': Event.objects.filter(validity_status='valid').count(),
-            'invalid': Event.objects.filter(validity_status='invalid').count(),
-            'unknown': Event.objects.filter(validity_status='unknown').count(),
-        }
-
-        # Duplicates
-        duplicate_count = Event.objects.filter(duplicate_flag=True).count()
-
         return Response({
-            'total_events': total_events,
+            'total_events': counts['total'],
             'active_nodes': active_nodes,
-            'events_by_latency_status': events_by_status,
-            'events_by_validity': events_by_validity,
-            'duplicate_count': duplicate_count
+            'events_by_latency_status': {
+                'normal': counts['normal'],
+                'delayed': counts['delayed'],
+                'obsolete': counts['obsolete'],
+            },
+            'events_by_validity': {
+                'valid': counts['valid'],
+                'invalid': counts['invalid'],
+                'unknown': counts['unknown'],
+            },
+            'duplicate_count': counts['duplicates']
         })
 
 
@@ -193,8 +220,18 @@ class TrackViewSet(viewsets.ReadOnlyModelViewSet):
 
     Provides list and retrieve endpoints for tracks.
     """
-    queryset = Track.objects.prefetch_related('contributors')
+    # Contributors only need their own columns and node name; skip the manager's
+    # track/event join
+    queryset = Track.objects.prefetch_related(
+        Prefetch(
+            'contributors',
+            queryset=TrackContributor.objects.select_related(None).select_related(
+                'sensor_node'
+            ).only('id', 'track', 'sensor_node', 'bearing_deg', 'ts_ns')
+        )
+    )
     serializer_class = TrackSerializer
+    pagination_class = TrackCursorPagination
     ordering = ['-last_ts_ns']
     filterset_fields = ['method', 'status']
 
@@ -216,11 +253,8 @@ def dashboard_view(request):
     - Interactive map with bearing corridors
     - Latency analytics
     """
-    # Get recent events (last 1000)
-    recent_events = Event.objects.select_related().order_by('-rx_ns')[:1000]
-
-    # Calculate KPIs
-    total_events = Event.objects.count()
+    # Get recent events for the table
+    recent_events = event_list_values(Event.objects.order_by('-rx_ns'))[:50]
 
     # Active nodes (last 5 minutes)
     five_minutes_ago_ns = get_current_time_ns() - (5 * 60 * 1_000_000_000)
@@ -228,8 +262,9 @@ def dashboard_view(request):
         rx_ns__gte=five_minutes_ago_ns
     ).values('sensor_node_id').distinct().count()
 
-    # Latency statistics (convert ns to ms)
+    # Total events and latency statistics in one scan (convert ns to ms)
     latency_stats = Event.objects.aggregate(
+        total_events=Count('id'),
         avg_latency=Avg('latency_ns'),
         min_latency=Min('latency_ns'),
         max_latency=Max('latency_ns')
@@ -244,18 +279,71 @@ def dashboard_view(request):
     active_tracks = Track.objects.filter(status='active').count()
 
     context = {
-        'total_events': total_events,
+        'total_events': latency_stats['total_events'],
         'active_nodes': active_nodes,
         'avg_latency_ms': avg_latency_ms,
         'min_latency_ms': min_latency_ms,
         'max_latency_ms': max_latency_ms,
         'active_tracks': active_tracks,
-        'recent_events': recent_events[:50],  # Display top 50
+        'recent_events': recent_events,
     }
 
     return render(request, 'monitoring/dashboard.html', context)
 
 
+# Per-node activity roll-up; portable across SQLite and PostgreSQL
+NODE_STATS_SQL = f"""
+    SELECT n.name,
+           COUNT(*),
+           CAST(AVG(e.latency_ns) AS DOUBLE PRECISION) / 1000000.0,
+           SUM(CASE WHEN e.latency_status = %s THEN 1 ELSE 0 END),
+           SUM(CASE WHEN e.latency_status = %s THEN 1 ELSE 0 END)
+    FROM {Event._meta.db_table} e
+    LEFT JOIN {SensorNode._meta.db_table} n ON n.id = e.sensor_node_id
+    WHERE e.rx_ns >= %s
+    GROUP BY e.sensor_node_id, n.name
+    ORDER BY COUNT(*) DESC
+"""
+
+
+# Bounds for node_stats_api's window_s (1 second to 1 day)
+NODE_STATS_MAX_WINDOW_S = 86_400
+
+
+@require_http_methods(["GET"])
+def node_stats_api(request):
+    """
+    JSON API endpoint for per-node event counts and latency.
+
+    Query parameters:
+        window_s: Look-back window in seconds (default: 300, max: 86400)
+    """
+    try:
+        window_s = int(request.GET.get('window_s', 300))
+    except ValueError:
+        window_s = 300
+    window_s = min(max(window_s, 1), NODE_STATS_MAX_WINDOW_S)
+    cutoff_ns = get_current_time_ns() - window_s * 1_000_000_000
+
+    with connection.cursor() as cursor:
+        cursor.execute(NODE_STATS_SQL, [Event.LATENCY_DELAYED, Event.LATENCY_OBSOLETE, cutoff_ns])
+        rows = cursor.fetchall()
+
+    return JsonResponse({
+        'window_s': window_s,
+        'nodes': [
+            {
+                'sensor_node_id': node_id,
+                'event_count': event_count,
+                'avg_latency_ms': avg_latency_ms,
+                'delayed_count': delayed_count,
+                'obsolete_count': obsolete_count,
+            }
+            for node_id, event_count, avg_latency_ms, delayed_count, obsolete_count in rows
+        ]
+    })
+
+
 def events_api(request):
     """
     JSON API endpoint for fetching events data.
@@ -272,7 +360,7 @@ def events_api(request):
     queryset = Event.objects.all()
 
     if node_id:
-        queryset = queryset.filter(sensor_node_id=node_id)
+        queryset = queryset.filter(sensor_node__name=node_id)
 
     if latency_status:
         queryset = queryset.filter(latency_status=latency_status)
@@ -281,27 +369,14 @@ def events_api(request):
     total_count = queryset.count()
 
     # Get events with pagination
-    events = queryset.order_by('-rx_ns')[offset:offset + limit]
+    events = event_list_values(queryset.order_by('-rx_ns'))[offset:offset + limit]
 
     # Serialize to JSON
     events_data = []
     for event in events:
-        events_data.append({
-            'event_id': event.event_id,
-            'sensor_type': event.sensor_type,
-            'sensor_node_id': event.sensor_node_id,
-            'ts_ns': event.ts_ns,
-            'rx_ns': event.rx_ns,
-            'latency_ms': event.latency_ms,
-            'latency_status': event.latency_status,
-            'lat': event.lat,
-            'lon': event.lon,
-            'bearing_deg': event.bearing_deg,
-            'bearing_conf': event.bearing_conf,
-            'duplicate_flag': event.duplicate_flag,
-            'object_track_id': event.object_track_id,
-            'created_at': event.created_at.isoformat() if event.created_at else None
-        })
+        event['sensor_node_id'] = event.pop('sensor_node_name')
+        event['created_at'] = event['created_at'].isoformat() if event['created_at'] else None
+        events_data.append(event)
 
     return JsonResponse({
         'total_count': total_count,